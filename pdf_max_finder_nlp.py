@@ -5,33 +5,54 @@ Uses natural language processing to understand context and scale modifiers
 (millions, billions, thousands, etc.) to find the true largest number.
 """
 
+import heapq
+import importlib.util
+import math
+import os
 import re
+import string
 import sys
+from bisect import bisect_left
+from collections import deque
+from decimal import Context, Decimal, MAX_EMAX, MIN_EMIN
 from pathlib import Path
-from typing import List, Tuple, Optional
-import PyPDF2
+from typing import Deque, Iterator, List, Tuple, Optional, Union
+
+from pdf_text import iter_page_texts
+
+# Optional linear-time regex engine for the tokenizer: google-re2. It is about
+# 2x slower than the stdlib re on typical documents, so it is only used when
+# PDF_MAX_FINDER_RE2=1 is set, e.g. for untrusted input where a guaranteed
+# linear-time match matters more than speed
+re2 = None  # type: ignore
+_RE2_AVAILABLE = False
+if os.environ.get('PDF_MAX_FINDER_RE2') == '1':
+    try:
+        import re2
+        _RE2_AVAILABLE = True
+    except Exception:
+        pass
+
+# Optional NLP: spaCy. Only looked up here; importing it takes a noticeable
+# fraction of a second, so load_spacy_model imports it on --use-spacy only
+_SPACY_AVAILABLE = importlib.util.find_spec('spacy') is not None
+
+# Pipeline components not needed for entity extraction; the NER component in
+# the trained English pipelines has its own tok2vec layer, so these can be
+# left out entirely instead of loaded and run on every document
+SPACY_UNUSED_COMPONENTS = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
 
-# Optional NLP: spaCy
-try:
-    import spacy
-    _SPACY_AVAILABLE = True
-except Exception:
-    spacy = None  # type: ignore
-    _SPACY_AVAILABLE = False
 
 def load_spacy_model(model_name: str = "en_core_web_sm"):
-    """Try to load a spaCy model. Returns the nlp object or None."""
+    """Try to load a spaCy model with only its NER component. Returns the nlp object or None."""
     if not _SPACY_AVAILABLE:
         return None
     try:
-        # Prefer a full model if installed
-        return spacy.load(model_name)
+        import spacy
+        return spacy.load(model_name, exclude=SPACY_UNUSED_COMPONENTS)
     except Exception:
-        try:
-            # Fall back to a blank English pipeline (no NER)
-            return spacy.blank('en')
-        except Exception:
-            return None
+        # A blank pipeline has no NER and would find nothing; use regex only
+        return None
 
 
 # Scale multipliers for common units
@@ -67,159 +88,271 @@ SCALE_MULTIPLIERS = {
     'm': 1_000_000,      # Often used for millions in finance
 }
 
-
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract all text from a PDF file."""
-    text = ""
+# Abbreviation suffixes recognised directly after small numbers ("150K", "3.5M")
+ABBREV_MULTIPLIERS = {'k': 1_000, 'm': 1_000_000, 'b': 1_000_000_000, 't': 1_000_000_000_000}
+
+
+# Pre-compiled patterns (compiled once at import rather than per number)
+
+# Scientific notation: 1.23e6, 1.23E6, 1.23e+6, 1.23e-6
+_SCI_RE = re.compile(r'(\d+\.?\d*)[eE]([+-]?\d+)')
+
+# Power notation: 10^120, 2^32
+_POWER_RE = re.compile(r'(\d+\.?\d*)\^(\d+)')
+
+# Scientific and power notation are evaluated in Decimal with an unbounded
+# exponent range, so values past float range (e.g. 2^5000) still compare
+# correctly instead of overflowing to inf
+Number = Union[float, Decimal]
+_DECIMAL_CONTEXT = Context(Emax=MAX_EMAX, Emin=MIN_EMIN)
+_FLOAT_MAX = Decimal(sys.float_info.max)
+
+# Scale words from most to least preferred when several are near the same
+# number: larger multiplier first, ties in SCALE_MULTIPLIERS order ("million"
+# over "millions"). Matches carry their rank here, so picking the best one is an
+# int comparison and rank 0 (trillion) can end the search early.
+_SCALES_SORTED = sorted(SCALE_MULTIPLIERS.items(), key=lambda x: -x[1])
+_SCALE_RANK = {w: rank for rank, (w, _) in enumerate(_SCALES_SORTED)}
+_NO_SCALE = len(_SCALES_SORTED)  # rank meaning "no scale word found"
+_MAX_MULTIPLIER = _SCALES_SORTED[0][1]
+
+# Characters on either side of a number searched for scale phrases
+CONTEXT_WINDOW = 50
+
+# Singular scale words as a regex alternation (plurals are matched as word + "s"),
+# longest first so "million" wins over "mil" and "m"
+_SCALE_WORDS_ALT = '|'.join(sorted(
+    (re.escape(w) for w in SCALE_MULTIPLIERS if not (w.endswith('s') and w[:-1] in SCALE_MULTIPLIERS)),
+    key=len, reverse=True))
+
+# Single-pass tokenizer: one alternation matches scientific notation, power
+# notation, plain numbers and scale phrases; callers dispatch on m.lastgroup.
+# Scale phrases carry their own cue so they can be applied to any nearby number:
+#   "in millions", "(millions)", "million dollars", "millions of dollars"
+# A bare scale word only applies when it directly follows a number ("3.5 million").
+# Matched against lowercased text (see _lower_text), so no case folding is
+# needed and scale words come out ready for _SCALE_RANK lookups.
+# Compiled with RE2 when requested and installed (see above), else the stdlib re.
+_TOKEN_RE = (re2 if _RE2_AVAILABLE else re).compile(
+    r'-?\$?(?P<sci>(?P<sci_base>\d+\.?\d*)e(?P<sci_exp>[+-]?\d+))'
+    r'|-?\$?(?P<pow>(?P<pow_base>\d+\.?\d*)\^(?P<pow_exp>\d+))'
+    r'|(?P<num>-?\$?\d{1,3}(?:,\d{3})+(?:\.\d+)?%?|-?\$?\d+\.?\d*%?)'
+    r'|(?P<scale>(?:(?P<scale_in>\bin\s+)|(?P<scale_open>\())?'
+    rf'\b(?P<scale_word>{_SCALE_WORDS_ALT})(?P<scale_plural>s)?\b'
+    r'(?:(?P<scale_close>\))|(?P<scale_currency>\s+(?:of\s+)?(?:dollars?|pounds?|euros?)))?)'
+)
+
+# Abbreviation directly following a number, matched from the number's end
+_ABBREV_RE = re.compile(r'\s*([kmbt])\b')
+
+# Numeric token inside a spaCy entity's text
+_ENTITY_NUMBER_RE = re.compile(r'-?\$?\d{1,3}(?:,\d{3})*(?:\.\d+)?%?|-?\$?\d+\.?\d*%?')
+
+# Bare scale words (with optional plural "s"), indexed once per text to scale spaCy entities
+_SCALE_WORD_RE = re.compile(rf'\b({_SCALE_WORDS_ALT})s?\b')
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def extract_text_from_pdf(pdf_path: str, backend: Optional[str] = None,
+                          use_cache: bool = True) -> Iterator[str]:
+    """Extract the text of a PDF file, yielding it one page at a time."""
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            num_pages = len(pdf_reader.pages)
-            print(f"Processing {num_pages} pages...")
-            
-            for page_num in range(num_pages):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text() + "\n"
-                
-                if (page_num + 1) % 10 == 0:
-                    print(f"Processed {page_num + 1}/{num_pages} pages...")
+        yield from iter_page_texts(pdf_path, backend, use_cache=use_cache)
     
     except Exception as e:
         print(f"Error reading PDF: {e}", file=sys.stderr)
         sys.exit(1)
-    
-    return text
 
 
-def parse_scientific_notation(text: str) -> List[Tuple[float, str, int, int]]:
+def _lower_text(text: str) -> str:
+    """Lowercase text for the case-sensitive patterns, keeping character offsets."""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A few characters (e.g. "İ") lowercase to two; fold only ASCII
+        lowered = text.translate(_ASCII_LOWER)
+    return lowered
+
+
+def _parse_number(number_str: str, is_percent: bool = False) -> float:
+    """
+    Parse a matched number such as "$1,234.5" or "45%".
+    Percentages (a trailing "%" or is_percent=True) are returned as fractions.
+    """
+    # A str.replace chain into float() beats both str.translate and a
+    # Python-level digit loop here; float() already parses in C
+    value = float(number_str.replace('$', '').replace(',', '').replace('%', ''))
+    if is_percent or number_str.endswith('%'):
+        # Convert percent to fraction (e.g., 50% -> 0.5)
+        value = value / 100.0
+    return value
+
+
+def _as_number(value: Decimal) -> Number:
+    """Return value as a float when it fits in one, else keep the Decimal."""
+    return float(value) if value <= _FLOAT_MAX else value
+
+
+def _scientific_value(base: str, exponent: str) -> Number:
+    """Value of scientific notation such as 1.23e6."""
+    return _as_number(Decimal(base).scaleb(int(exponent), _DECIMAL_CONTEXT))
+
+
+def _power_value(base: str, exponent: str) -> Number:
+    """Value of power notation such as 10^12."""
+    if int(exponent) == 0:
+        return 1.0  # Decimal rejects 0^0; match float arithmetic (x^0 == 1)
+    return _as_number(_DECIMAL_CONTEXT.power(Decimal(base), int(exponent)))
+
+
+def format_number(value: Number) -> str:
+    """Format a value with thousands separators, or in E notation past float range."""
+    if isinstance(value, Decimal):
+        return f"{value:.6E}"
+    return f"{value:,.2f}"
+
+
+def parse_scientific_notation(text: str) -> List[Tuple[Number, str, int, int]]:
     """
     Parse scientific notation (e.g. 1.23e6) and power notation (e.g. 10^12).
     Returns list of tuples (value, original_string, start_index, end_index).
     """
     results = []
     
-    # Pattern for scientific notation: 1.23e6, 1.23E6, 1.23e+6, 1.23e-6
-    sci_pattern = r'(\d+\.?\d*)[eE]([+-]?\d+)'
-    for match in re.finditer(sci_pattern, text):
+    for match in _SCI_RE.finditer(text):
         try:
-            base = float(match.group(1))
-            exponent = int(match.group(2))
-            value = base * (10 ** exponent)
+            value = _scientific_value(match.group(1), match.group(2))
             results.append((value, match.group(0), match.start(), match.end()))
-        except (ValueError, OverflowError):
+        except (ValueError, ArithmeticError):
             continue
     
-    # Pattern for power notation: 10^120, 2^32
-    power_pattern = r'(\d+\.?\d*)\^(\d+)'
-    for match in re.finditer(power_pattern, text):
+    for match in _POWER_RE.finditer(text):
         try:
-            base = float(match.group(1))
-            exponent = int(match.group(2))
-            # Limit exponent to prevent overflow
-            if exponent <= 1000:
-                value = base ** exponent
-                results.append((value, match.group(0), match.start(), match.end()))
-        except (ValueError, OverflowError):
+            value = _power_value(match.group(1), match.group(2))
+            results.append((value, match.group(0), match.start(), match.end()))
+        except (ValueError, ArithmeticError):
             continue
     
     return results
 
 
-def extract_numbers_with_context(text: str, context_window: int = 50, nlp: Optional[object] = None) -> List[Tuple[float, str]]:
+def extract_numbers_with_context(text: str, context_window: int = CONTEXT_WINDOW, nlp: Optional[object] = None,
+                                 lower_bound: Number = -math.inf, page_start: int = 0,
+                                 page_end: Optional[int] = None) -> List[Tuple[Number, str]]:
     """
     Extract numbers along with their surrounding context to detect scale modifiers.
     Returns list of (actual_value, context_string) tuples.
+    
+    The text is tokenized in a single regex pass; each number is then paired
+    with the scale phrases found within context_window characters of it.
+    Numbers that stay below lower_bound even at the largest multiplier are
+    returned unscaled, without searching for scale phrases.
+    Only numbers starting in text[page_start:page_end] are returned; the rest
+    of the text just provides context (see _iter_page_windows).
     """
+    if page_end is None:
+        page_end = len(text)
     numbers_with_context = []
+    used_spans = []  # spaCy entity spans (non-overlapping), to dedupe regex numbers against
     
-    # First, handle scientific notation separately (and keep spans to avoid duplicates)
-    used_spans = []  # list of (start, end) to dedupe
-    sci_numbers = parse_scientific_notation(text)
-    for value, orig, start, end in sci_numbers:
-        numbers_with_context.append((value, orig))
-        used_spans.append((start, end))
-
     # If spaCy is available and a model was provided, use entity extraction first
     if _SPACY_AVAILABLE and nlp is not None:
         try:
             # spacy-based extraction will return triples with spans for deduplication
             spacy_results = extract_entities_with_spacy(nlp, text)
             for val, ctx, span in spacy_results:
-                numbers_with_context.append((val, ctx))
+                if page_start <= span[0] < page_end:
+                    numbers_with_context.append((val, ctx))
                 used_spans.append(span)
         except Exception:
             # Fall back silently to regex approach if spaCy extraction fails
             pass
+    used_spans.sort()
+    used_starts = [s for s, _ in used_spans]
     
-    # Pattern to match numbers with various formats
-    number_pattern = r'-?\$?\d{1,3}(?:,\d{3})+(?:\.\d+)?%?|-?\$?\d+\.?\d*%?'
+    # One pass over the text: notation values are final, plain numbers and
+    # scale phrases are collected (in text order) for association below.
+    # A bare scale word directly after a number ("3.5 million") is attached
+    # to that number here; only phrases with their own cue are kept in scales.
+    numbers = []  # (start, end, number_str, rank of the scale word directly after it)
+    scales = []   # (start, end, scale rank)
+    lowered = _lower_text(text)
+    for match in _TOKEN_RE.finditer(lowered):
+        kind = match.lastgroup
+        if kind != 'scale' and not page_start <= match.start() < page_end:
+            continue
+        if kind == 'num':
+            numbers.append((match.start(), match.end(), match.group('num'), _NO_SCALE))
+        elif kind == 'scale':
+            start, end = match.start(), match.end()
+            scale_word = match.group('scale_word')
+            is_prefixed = bool(match.group('scale_in') or match.group('scale_open'))
+            if (match.group('scale_in') or match.group('scale_currency')
+                    or (match.group('scale_open') and match.group('scale_close'))):
+                scales.append((start, end, _SCALE_RANK[scale_word]))
+            if numbers and not is_prefixed and (
+                    match.group('scale_plural') is None or scale_word + 's' in SCALE_MULTIPLIERS):
+                number_pos, number_end, number_str, _ = numbers[-1]
+                if (start > number_end and end - number_end <= context_window
+                        and text[number_end:start].isspace()):
+                    numbers[-1] = (number_pos, number_end, number_str, _SCALE_RANK[scale_word])
+        else:
+            try:
+                if kind == 'sci':
+                    value = _scientific_value(match.group('sci_base'), match.group('sci_exp'))
+                else:
+                    value = _power_value(match.group('pow_base'), match.group('pow_exp'))
+                # Report the notation as written, not lowercased ("1.5E6")
+                start, end = match.span()
+                numbers_with_context.append((value, text[start:end].lstrip('-$')))
+            except (ValueError, ArithmeticError):
+                continue
     
-    for match in re.finditer(number_pattern, text):
-        number_str = match.group(0)
-        number_pos = match.start()
-        number_end = match.end()
-
-        # Skip if this span overlaps a previously-used span (from sci or spaCy)
-        overlap = False
-        for s, e in used_spans:
-            if not (number_end <= s or number_pos >= e):
-                overlap = True
-                break
-        if overlap:
+    first_scale = 0  # index of the first scale phrase that can still be in range
+    for number_pos, number_end, number_str, best_rank in numbers:
+        # Skip if this span overlaps a spaCy entity. Entities don't overlap each
+        # other, so only the last one starting before this number ends can.
+        i = bisect_left(used_starts, number_end)
+        if i and used_spans[i - 1][1] > number_pos:
             continue
         
-        # Get surrounding context
+        # Surrounding context
         context_start = max(0, number_pos - context_window)
-        context_end = min(len(text), match.end() + context_window)
-        context = text[context_start:context_end].lower()
+        context_end = min(len(text), number_end + context_window)
         
         # Extract the base number
         try:
-            cleaned = number_str.replace('$', '').replace(',', '')
-            is_percent = '%' in number_str
-            base_number = float(cleaned.replace('%', ''))
-            if is_percent:
-                # Convert percent to fraction (e.g., 50% -> 0.5)
-                base_number = base_number / 100.0
+            base_number = _parse_number(number_str)
         except ValueError:
             continue
         
-        # Look for scale multipliers in the context
-        multiplier = 1.0
-        found_scale = None
+        # No scale can lift this number to lower_bound, so skip the search
+        if max(base_number, base_number * _MAX_MULTIPLIER) < lower_bound:
+            numbers_with_context.append((base_number, number_str))
+            continue
         
-        # Check for scale words before and after the number
-        for scale_word, scale_value in SCALE_MULTIPLIERS.items():
-            # Look for patterns like "3.5 million", "million dollars", "in millions"
-            patterns = [
-                rf'\b{re.escape(number_str)}\s+{scale_word}\b',  # "3.5 million"
-                rf'\b{scale_word}\s+(?:of\s+)?(?:dollars?|pounds?|euros?)',  # "million dollars"
-                rf'\bin\s+{scale_word}s?\b',  # "in millions"
-                rf'\({scale_word}s?\)',  # "(millions)"
-                rf'{scale_word}s?\s+of\s+(?:dollars?|pounds?)',  # "millions of dollars"
-            ]
-            
-            for pattern in patterns:
-                if re.search(pattern, context, re.IGNORECASE):
-                    if scale_value > multiplier:
-                        multiplier = scale_value
-                        found_scale = scale_word
+        # Look for scale phrases in the context. Numbers arrive in text order,
+        # so phrases that start before this window never apply again.
+        while first_scale < len(scales) and scales[first_scale][0] < context_start:
+            first_scale += 1
+        for i in range(first_scale, len(scales)):
+            start, end, rank = scales[i]
+            if start >= context_end or best_rank == 0:
+                break
+            if rank < best_rank and end <= context_end:
+                best_rank = rank
+        found_scale, multiplier = _SCALES_SORTED[best_rank] if best_rank < _NO_SCALE else (None, 1.0)
         
         # Special handling for standalone letters that might be abbreviations
         # Only apply if the number is small (< 1000) to avoid false positives
         if base_number < 1000 and multiplier == 1.0:
             # Look for patterns like "3.5M", "150K", "2.3B"
-            abbrev_pattern = rf'{re.escape(number_str)}\s*([KMBT])\b'
-            abbrev_match = re.search(abbrev_pattern, text[context_start:context_end], re.IGNORECASE)
+            abbrev_match = _ABBREV_RE.match(lowered, number_end, context_end)
             if abbrev_match:
-                abbrev = abbrev_match.group(1).lower()
-                abbrev_multipliers = {'k': 1_000, 'm': 1_000_000, 'b': 1_000_000_000, 't': 1_000_000_000_000}
-                if abbrev in abbrev_multipliers:
-                    multiplier = abbrev_multipliers[abbrev]
-                    found_scale = abbrev.upper()
-        # mark this regex match span as used to avoid duplicates later
-        used_spans.append((number_pos, number_end))
-
+                abbrev = abbrev_match.group(1)
+                multiplier = ABBREV_MULTIPLIERS[abbrev]
+                found_scale = abbrev.upper()
+        
         actual_value = base_number * multiplier
         
         # Store with context information
@@ -244,40 +377,38 @@ def extract_entities_with_spacy(nlp, text: str) -> List[Tuple[float, str, Tuple[
 
     doc = nlp(text)
 
-    # Regex to find a numeric token inside the entity text
-    num_re = re.compile(r'-?\$?\d{1,3}(?:,\d{3})*(?:\.\d+)?%?|-?\$?\d+\.?\d*%?')
+    # Index every scale word in one pass; each entity then finds the words in
+    # its window by binary search instead of running one pattern per word
+    scale_hits = [(m.start(), m.end(), _SCALE_RANK[m.group(1)]) for m in _SCALE_WORD_RE.finditer(_lower_text(text))]
+    scale_starts = [start for start, _, _ in scale_hits]
 
     for ent in doc.ents:
         if ent.label_ not in {'MONEY', 'QUANTITY', 'PERCENT', 'CARDINAL'}:
             continue
 
-        ent_text = ent.text
-        m = num_re.search(ent_text)
+        m = _ENTITY_NUMBER_RE.search(text, ent.start_char, ent.end_char)
         if not m:
             continue
 
         number_str = m.group(0)
         try:
-            cleaned = number_str.replace('$', '').replace(',', '')
-            is_percent = '%' in number_str or ent.label_ == 'PERCENT'
-            base_number = float(cleaned.replace('%', ''))
-            if is_percent:
-                base_number = base_number / 100.0
+            base_number = _parse_number(number_str, is_percent=ent.label_ == 'PERCENT')
         except ValueError:
             continue
 
         # Look for scale words in a small window after the entity
         context_start = max(0, ent.start_char - 20)
         context_end = min(len(text), ent.end_char + 50)
-        context = text[context_start:context_end].lower()
 
-        multiplier = 1.0
-        found_scale = None
-        for scale_word, scale_value in SCALE_MULTIPLIERS.items():
-            if re.search(rf'\b{re.escape(scale_word)}s?\b', context):
-                if scale_value > multiplier:
-                    multiplier = scale_value
-                    found_scale = scale_word
+        best_rank = _NO_SCALE
+        first = bisect_left(scale_starts, context_start)
+        last = bisect_left(scale_starts, context_end)
+        for start, end, rank in scale_hits[first:last]:
+            if rank < best_rank and end <= context_end:
+                best_rank = rank
+                if best_rank == 0:
+                    break
+        found_scale, multiplier = _SCALES_SORTED[best_rank] if best_rank < _NO_SCALE else (None, 1.0)
 
         actual_value = base_number * multiplier
         if found_scale:
@@ -290,59 +421,119 @@ def extract_entities_with_spacy(nlp, text: str) -> List[Tuple[float, str, Tuple[
     return results
 
 
-def find_largest_number_nlp(pdf_path: str) -> Tuple[float, str, List[Tuple[float, str]]]:
+def _iter_page_windows(pages: Iterator[str], overlap: int) -> Iterator[Tuple[str, int, int]]:
+    """
+    Yield each page with up to overlap characters of the neighbouring pages
+    around it, as (text, page_start, page_end) where text[page_start:page_end]
+    is the page itself. Pages are joined with a newline, so scale cues just
+    across a page break still apply, as they do in the whole document.
+    """
+    tail = ''
+    ahead: Deque[str] = deque()  # the current page, then the pages read ahead
+    ahead_chars = 0  # length of the pages after the current one, with newlines
+    exhausted = False
+    while True:
+        # Read ahead until the following pages fill overlap characters; blank
+        # or short pages mean the head can span several of them
+        while not exhausted and (not ahead or ahead_chars < overlap):
+            page = next(pages, None)
+            if page is None:
+                exhausted = True
+            else:
+                if ahead:
+                    ahead_chars += len(page) + 1
+                ahead.append(page)
+        if not ahead:
+            return
+        
+        page = ahead.popleft()
+        head = "\n".join(following[:overlap] for following in ahead)[:overlap]
+        yield tail + page + "\n" + head, len(tail), len(tail) + len(page)
+        tail = (tail + page + "\n")[-overlap:]
+        if ahead:
+            ahead_chars -= len(ahead[0]) + 1
+
+
+def find_largest_number_nlp(pdf_path: str, use_spacy: bool = False,
+                            use_cache: bool = True) -> Tuple[Number, str, List[Tuple[Number, str]]]:
     """
     Find the largest number in a PDF using NLP context awareness.
+    spaCy entity extraction is only run when use_spacy is True; the regex
+    heuristics already cover the numbers and scale words it would find.
     Returns (max_value, context, top_10_numbers)
     """
     print(f"Reading PDF: {pdf_path}")
     
-    # Extract text from PDF
-    text = extract_text_from_pdf(pdf_path)
+    # If requested, try to load a spaCy model. If spaCy or the model is not
+    # available we'll fall back to the regex-based extraction.
+    nlp = None
+    if use_spacy:
+        if not _SPACY_AVAILABLE:
+            print("spaCy is not installed; falling back to regex heuristics.")
+        else:
+            nlp = load_spacy_model()
+            if nlp is None:
+                print("spaCy is installed but no model was found; falling back to regex heuristics.")
+    
+    # Extract numbers with context page by page, keeping the top 10 so far.
+    # Once 10 values are known, a number that cannot reach the 10th even at
+    # the largest multiplier skips the scale search on later pages.
+    # Min-heap of the 10 largest (value, -seq, context) entries; -seq makes
+    # the earliest of equal values win, as in a stable descending sort
+    heap: List[Tuple[Number, int, str]] = []
+    num_chars = 0
+    num_values = 0
+    # Twice the context window of overlap, so a word cut off at either edge
+    # lies outside the window of every number on the page
+    pages = extract_text_from_pdf(pdf_path, use_cache=use_cache)
+    windows = _iter_page_windows(pages, 2 * CONTEXT_WINDOW)
+    for page_num, (text, page_start, page_end) in enumerate(windows):
+        if page_num == 0:
+            # Analysis runs alongside extraction, once the first page is in
+            print("Analyzing numbers with NLP context...")
+        num_chars += page_end - page_start
+        lower_bound = heap[0][0] if len(heap) == 10 else -math.inf
+        for value, context in extract_numbers_with_context(text, nlp=nlp, lower_bound=lower_bound,
+                                                           page_start=page_start, page_end=page_end):
+            num_values += 1
+            entry = (value, -num_values, context)
+            if len(heap) < 10:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
     
-    if not text:
+    if not num_chars:
         print("Warning: No text extracted from PDF", file=sys.stderr)
         return None, None, []
     
-    print(f"Extracted {len(text)} characters of text")
-    
-    # Extract numbers with context
-    print("Analyzing numbers with NLP context...")
-    # Try to load a spaCy model (if spaCy is installed). If no model is available
-    # we'll fall back to the original regex-based extraction.
-    nlp = None
-    if _SPACY_AVAILABLE:
-        nlp = load_spacy_model()
-        if nlp is None:
-            print("spaCy is installed but no model was found; falling back to regex heuristics.")
-
-    numbers_with_context = extract_numbers_with_context(text, nlp=nlp)
+    print(f"Extracted {num_chars} characters of text")
     
-    if not numbers_with_context:
+    if not num_values:
         print("Warning: No numbers found in document", file=sys.stderr)
         return None, None, []
     
-    print(f"Found {len(numbers_with_context)} numerical values (including scaled values)")
+    print(f"Found {num_values} numerical values (including scaled values)")
     
-    # Sort by value (descending)
-    sorted_numbers = sorted(numbers_with_context, key=lambda x: x[0], reverse=True)
+    # Top 10 by value (descending) for display
+    top_10 = [(value, context) for value, _, context in sorted(heap, reverse=True)]
     
     # Get the maximum
-    max_number, max_context = sorted_numbers[0]
-    
-    # Get top 10 for display
-    top_10 = sorted_numbers[:10]
+    max_number, max_context = top_10[0]
     
     return max_number, max_context, top_10
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python find_max_number_nlp.py <path_to_pdf>")
+    args = [arg for arg in sys.argv[1:] if arg not in ('--use-spacy', '--no-cache')]
+    use_spacy = '--use-spacy' in sys.argv[1:]
+    use_cache = '--no-cache' not in sys.argv[1:]
+    
+    if len(args) < 1:
+        print("Usage: python find_max_number_nlp.py [--use-spacy] [--no-cache] <path_to_pdf>")
         print("Example: python find_max_number_nlp.py document.pdf")
         sys.exit(1)
     
-    pdf_path = sys.argv[1]
+    pdf_path = args[0]
     
     # Check if file exists
     if not Path(pdf_path).exists():
@@ -350,11 +541,11 @@ def main():
         sys.exit(1)
     
     # Find the largest number with NLP
-    max_number, max_context, top_10 = find_largest_number_nlp(pdf_path)
+    max_number, max_context, top_10 = find_largest_number_nlp(pdf_path, use_spacy=use_spacy, use_cache=use_cache)
     
     if max_number is not None:
         print(f"\n{'='*70}")
-        print(f"LARGEST NUMBER FOUND (NLP-Enhanced): {max_number:,.2f}")
+        print(f"LARGEST NUMBER FOUND (NLP-Enhanced): {format_number(max_number)}")
         print(f"Context: {max_context}")
         print(f"{'='*70}")
         
@@ -362,7 +553,7 @@ def main():
             print(f"\nTop 10 Largest Numbers Found:")
             print(f"{'-'*70}")
             for i, (value, context) in enumerate(top_10, 1):
-                print(f"{i:2d}. {value:>20,.2f}  |  {context}")
+                print(f"{i:2d}. {format_number(value):>20}  |  {context}")
             print(f"{'-'*70}")
         
         print("\n💡 Note: This uses NLP to understand context like 'in millions'")
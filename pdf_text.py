@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+PDF text extraction shared by the PDF Maximum Number Finder scripts.
+Yields page texts using PDFium (or PyPDF2), in parallel for larger
+documents, with an on-disk cache of previously extracted files.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import sqlite3
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import Deque, Iterator, List, Optional
+import PyPDF2
+
+# Optional native PDF backend: PDFium (via pypdfium2)
+try:
+    import pypdfium2 as pdfium
+    _PDFIUM_AVAILABLE = True
+except Exception:
+    pdfium = None  # type: ignore
+    _PDFIUM_AVAILABLE = False
+
+# Optional fast non-cryptographic hash for cache keys; falls back to BLAKE2
+try:
+    import xxhash
+    _XXHASH_AVAILABLE = True
+except Exception:
+    xxhash = None  # type: ignore
+    _XXHASH_AVAILABLE = False
+
+# Documents with fewer pages are extracted in-process; below this the cost
+# of starting worker processes outweighs the parallel speedup
+PARALLEL_MIN_PAGES = 32
+# Largest page range handed to one worker; with at most two ranges per worker
+# pending at a time, this bounds the text held for a large document
+PARALLEL_CHUNK_PAGES = 32
+
+# Extracted page texts are cached here, keyed by a hash of the file contents,
+# so re-running on an unchanged PDF skips extraction. Set to None (or pass
+# use_cache=False / --no-cache) to disable.
+CACHE_PATH: Optional[Path] = Path.home() / '.cache' / 'pdf_max_finder' / 'page_text.sqlite3'
+# Least recently used documents beyond this many are evicted from the cache
+CACHE_MAX_DOCUMENTS = 32
+# Extracted pages are written to the cache in transactions of this many pages
+CACHE_BATCH_PAGES = 32
+
+
+def _count_pages(pdf_path: str, backend: str) -> int:
+    """Return the number of pages in a PDF file."""
+    if backend == 'pypdf2':
+        with open(pdf_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
+    
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _pdfium_page_text(pdf, index: int) -> str:
+    """Extract one page's text, releasing PDFium's page and text buffers straight away."""
+    page = pdf[index]
+    try:
+        textpage = page.get_textpage()
+        try:
+            return textpage.get_text_range()
+        finally:
+            textpage.close()
+    finally:
+        page.close()
+
+
+def _iter_page_range(pdf_path: str, backend: str, start: int, stop: int) -> Iterator[str]:
+    """
+    Yield the text of pages [start, stop) of a PDF file, one page at a time.
+    Opens its own handle so it can run in a worker process.
+    """
+    if backend == 'pypdf2':
+        # Memory-map the file so PyPDF2's seek/read calls are served from the
+        # page cache shared by all workers instead of separate buffered reads
+        with open(pdf_path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as pdf_map:
+            pdf_reader = PyPDF2.PdfReader(pdf_map)
+            for i in range(start, stop):
+                yield pdf_reader.pages[i].extract_text()
+        return
+    
+    # PDFium reads the file natively by path (it does not accept mmap objects)
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        for i in range(start, stop):
+            yield _pdfium_page_text(pdf, i)
+    finally:
+        pdf.close()
+
+
+def _extract_page_range(pdf_path: str, backend: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop) of a PDF file as a list (for worker processes)."""
+    return list(_iter_page_range(pdf_path, backend, start, stop))
+
+
+def _map_page_ranges(executor: ProcessPoolExecutor, pdf_path: str, backend: str,
+                     num_pages: int, workers: int) -> Iterator[List[str]]:
+    """
+    Extract a PDF's pages in the pool as page ranges, yielding each range's
+    texts in order. At most two ranges per worker are queued or finished but
+    not yet consumed, so a slow consumer does not buffer the whole document.
+    """
+    # Oversubscribe the pool with ~1.5x as many ranges as workers so workers
+    # that finish early pick up the remaining pages, up to the chunk size
+    chunk = min(PARALLEL_CHUNK_PAGES, math.ceil(num_pages / (workers * 1.5)))
+    pending: Deque[Future] = deque()
+    try:
+        for start in range(0, num_pages, chunk):
+            if len(pending) == 2 * workers:
+                yield pending.popleft().result()
+            pending.append(executor.submit(_extract_page_range, pdf_path, backend,
+                                           start, min(start + chunk, num_pages)))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _document_key(pdf_path: str, backend: str) -> str:
+    """Cache key for a PDF: the extraction backend plus a hash of the file bytes."""
+    digest = xxhash.xxh3_128() if _XXHASH_AVAILABLE else hashlib.blake2b(digest_size=16)
+    with open(pdf_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return f"{backend}:{digest.hexdigest()}"
+
+
+def _open_cache() -> Optional[sqlite3.Connection]:
+    """Open the page text cache, or return None if it is disabled or unusable."""
+    if CACHE_PATH is None:
+        return None
+    cache = None
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # Writes are short single transactions; wait for another run's
+        # transaction to finish rather than failing with "database is locked"
+        cache = sqlite3.connect(str(CACHE_PATH), timeout=5.0)
+        cache.execute("PRAGMA journal_mode=WAL")
+        cache.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_key TEXT PRIMARY KEY, num_pages INTEGER NOT NULL, last_used REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS pages (
+                doc_key TEXT NOT NULL, page_num INTEGER NOT NULL, text TEXT NOT NULL,
+                PRIMARY KEY (doc_key, page_num)) WITHOUT ROWID;
+        """)
+        return cache
+    except (OSError, sqlite3.Error):
+        if cache is not None:
+            cache.close()
+        return None
+
+
+def _cached_page_count(cache: sqlite3.Connection, doc_key: str) -> Optional[int]:
+    """Return the page count of a cached document (marking it as used), or None."""
+    try:
+        row = cache.execute("SELECT num_pages FROM documents WHERE doc_key = ? AND num_pages >= 0",
+                            (doc_key,)).fetchone()
+        if row is None:
+            return None
+        with cache:
+            cache.execute("UPDATE documents SET last_used = julianday('now') WHERE doc_key = ?",
+                          (doc_key,))
+        return row[0]
+    except sqlite3.Error:
+        return None
+
+
+def _cached_page_text(cache: sqlite3.Connection, doc_key: str, page_num: int) -> Optional[str]:
+    """Return the cached text of one page, or None if it cannot be read."""
+    try:
+        row = cache.execute("SELECT text FROM pages WHERE doc_key = ? AND page_num = ?",
+                            (doc_key, page_num)).fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row is not None else None
+
+
+# Page count recorded for a document whose pages are still being written
+_INCOMPLETE = -1
+
+
+def _begin_cached_document(cache: sqlite3.Connection, doc_key: str) -> bool:
+    """Register a document whose pages are about to be written. Returns False on failure."""
+    try:
+        with cache:
+            cache.execute("DELETE FROM pages WHERE doc_key = ?", (doc_key,))
+            cache.execute("INSERT OR REPLACE INTO documents VALUES (?, ?, julianday('now'))",
+                          (doc_key, _INCOMPLETE))
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def _store_cached_pages(cache: sqlite3.Connection, doc_key: str, first_page: int,
+                        pages: List[str]) -> bool:
+    """Write a batch of consecutive pages in one short transaction. Returns False on failure."""
+    try:
+        with cache:
+            cache.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?)",
+                              ((doc_key, first_page + i, text) for i, text in enumerate(pages)))
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def _finish_cached_document(cache: sqlite3.Connection, doc_key: str, num_pages: int) -> bool:
+    """Mark a document's pages complete and evict the least recently used documents."""
+    try:
+        with cache:
+            cache.execute("UPDATE documents SET num_pages = ?, last_used = julianday('now') "
+                          "WHERE doc_key = ?", (num_pages, doc_key))
+            cache.execute("DELETE FROM documents WHERE doc_key NOT IN "
+                          "(SELECT doc_key FROM documents ORDER BY last_used DESC LIMIT ?)",
+                          (CACHE_MAX_DOCUMENTS,))
+            cache.execute("DELETE FROM pages WHERE doc_key NOT IN (SELECT doc_key FROM documents)")
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def _discard_cached_document(cache: sqlite3.Connection, doc_key: str) -> None:
+    """Remove a partly written document from the cache, if possible."""
+    try:
+        with cache:
+            cache.execute("DELETE FROM pages WHERE doc_key = ?", (doc_key,))
+            cache.execute("DELETE FROM documents WHERE doc_key = ?", (doc_key,))
+    except sqlite3.Error:
+        pass  # Left for a later run to overwrite or evict
+
+
+def iter_page_texts(pdf_path: str, backend: Optional[str] = None,
+                    max_workers: Optional[int] = None, use_cache: bool = True) -> Iterator[str]:
+    """
+    Yield the text of each page of a PDF file, one string per page.
+    Uses the native PDFium backend when available; pass backend='pypdf2'
+    to force the pure-Python PyPDF2 extractor.
+    
+    Pages are yielded as they are extracted. Larger documents are split
+    into page ranges that are extracted in parallel worker processes, with
+    at most two ranges per worker held ahead of the caller; pages are still
+    yielded in order. Extracted pages are cached on disk (see CACHE_PATH),
+    in batches, for re-runs on the same file unless use_cache is False;
+    cache errors fall back to plain extraction.
+    """
+    if backend is None:
+        backend = 'pdfium' if _PDFIUM_AVAILABLE else 'pypdf2'
+    
+    cache = _open_cache() if use_cache else None
+    doc_key = _document_key(pdf_path, backend) if cache is not None else ''
+    executor = None
+    writing = False  # pages are being written to the cache
+    incomplete = False  # the cache holds a partly written entry for this document
+    try:
+        num_cached = _cached_page_count(cache, doc_key) if cache is not None else None
+        if num_cached is not None:
+            print(f"Processing {num_cached} pages (cached)...")
+            for page_num in range(num_cached):
+                page_text = _cached_page_text(cache, doc_key, page_num)
+                if page_text is None:
+                    # The cache became unreadable part way; extract the rest
+                    yield from _iter_page_range(pdf_path, backend, page_num, num_cached)
+                    return
+                yield page_text
+            return
+        
+        num_pages = _count_pages(pdf_path, backend)
+        print(f"Processing {num_pages} pages...")
+        
+        workers = max_workers or os.cpu_count() or 1
+        if workers == 1 or num_pages < PARALLEL_MIN_PAGES:
+            page_texts = _iter_page_range(pdf_path, backend, 0, num_pages)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            page_texts = chain.from_iterable(
+                _map_page_ranges(executor, pdf_path, backend, num_pages, workers))
+        
+        # Pages go to the cache in short batch transactions, so neither the
+        # whole document nor a long-held write lock is needed
+        writing = incomplete = cache is not None and _begin_cached_document(cache, doc_key)
+        batch: List[str] = []
+        for page_num, page_text in enumerate(page_texts):
+            if writing:
+                batch.append(page_text)
+                if len(batch) == CACHE_BATCH_PAGES:
+                    writing = _store_cached_pages(cache, doc_key, page_num + 1 - len(batch), batch)
+                    batch = []
+            yield page_text
+            
+            if (page_num + 1) % 10 == 0:
+                print(f"Processed {page_num + 1}/{num_pages} pages...")
+        
+        # Only documents that were extracted to the end are marked complete
+        if (writing and _store_cached_pages(cache, doc_key, num_pages - len(batch), batch)
+                and _finish_cached_document(cache, doc_key, num_pages)):
+            incomplete = False
+    finally:
+        if cache is not None:
+            if incomplete:
+                _discard_cached_document(cache, doc_key)
+            cache.close()
+        if executor is not None:
+            executor.shutdown()